@@ -1,6 +1,7 @@
 import sys
 import os
 import argparse
+import concurrent.futures
 import pandas as pd
 import numpy as np
 import matplotlib
@@ -8,7 +9,7 @@ matplotlib.use("Agg")
 import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
 from matplotlib.collections import PatchCollection
-import matplotlib.patheffects as mpe
+import matplotlib.transforms as mtransforms
 
 # Default colors are similar to matplotlib 2.0 defaults and are taken from:
 # https://github.com/vega/vega/wiki/Scales#scale-range-literals
@@ -148,7 +149,10 @@ def process_args(args):
             chr2use += [str(x) for x in range(start, end+1)]
         else:
             chr2use.append(a.strip())
-    arg_dict["chr2use"] = chr2use
+    # drop repeated ids keeping the first occurrence (chr2use serves as the
+    # category list of the chromosome column, which must be duplicate-free)
+    # and freeze the result so no downstream step can mutate it
+    arg_dict["chr2use"] = tuple(dict.fromkeys(chr2use))
 
     msg = " option should have a value for each sumstat file or a single value"
     assert len(args.sep) == n, "--sep" + msg
@@ -165,7 +169,7 @@ def get_snp_ids(fname):
     if fname == "NA":
         return np.array([])
     else:
-        return pd.read_table(fname,header=None,squeeze=True).values
+        return pd.read_table(fname,header=None).iloc[:,0].values
 
 
 def get_lead(fname):
@@ -184,17 +188,86 @@ def get_indep_sig(fname):
         return df["INDEP_SNP"].values
 
 
-def get_annot(fname):
+def get_annot(fname, valid_snp_ids):
     """
     Read annotation file and return Series: index=SNP ids and values=SNP labels.
-    Return empty Series if fname == "NA"
+    The file is read in chunks and only annotations of SNPs from valid_snp_ids
+    are kept, so annotations which cannot appear in the figure are dropped
+    without ever being materialized. Return empty Series if fname == "NA"
+    Args:
+        fname: annotation file name
+        valid_snp_ids: set of SNP ids which can be plotted
     """
     if fname == "NA":
-        return pd.Series([])
+        return pd.Series([], dtype=object)
     else:
-        series = pd.read_table(fname,header=None,names=["snp", "label"],
-            index_col="snp",squeeze=True)
-        return series
+        chunks = [chunk[chunk["snp"].isin(valid_snp_ids)]
+            for chunk in pd.read_table(fname, header=None,
+                names=["snp", "label"], chunksize=100000)]
+        annot_df = pd.concat(chunks)
+        return pd.Series(annot_df["label"].values, index=annot_df["snp"].values)
+
+
+try:
+    # optional: fuse the per-element Gumbel key computation into a parallel
+    # JIT-compiled loop (one pass over memory instead of several numpy temps)
+    import numba
+
+    @numba.njit(parallel=True, cache=True)
+    def _gumbel_keys(w, u):
+        keys = np.empty(len(w))
+        for i in numba.prange(len(w)):
+            keys[i] = np.log(w[i]) - np.log(-np.log(u[i]))
+        return keys
+except ImportError:
+    def _gumbel_keys(w, u):
+        with np.errstate(divide="ignore"):  # w = 0 for SNPs with p-value = 1
+            return np.log(w) - np.log(-np.log(u))
+
+
+def gumbel_top_n(w, n, rng):
+    """
+    Weighted sampling without replacement via the Gumbel-top-k trick
+    (Efraimidis-Spirakis): the n largest log(w) + Gumbel noise values are
+    distributed as np.random.choice(..., size=n, replace=False, p=w/w.sum()),
+    but require only a single pass and no weight normalization.
+    Args:
+        w: array of non-negative sampling weights
+        n: number of elements to sample
+        rng: numpy random Generator to draw from
+    Returns:
+        integer positions of the n sampled elements
+    """
+    u = rng.random(len(w))
+    keys = _gumbel_keys(w, u)
+    return np.argpartition(keys, -n)[-n:]
+
+
+def minmax_bin_sample(chr_codes, bp, log10p, nbins):
+    """
+    Deterministically select per-bin extreme variants along the genome.
+    Variants are sorted by (chromosome, position) and split into nbins equally
+    sized bins; within each bin the variants with min and max -log10(p) are
+    selected. This guarantees that the envelope of the Manhattan plot (in
+    particular every local peak resolvable at nbins horizontal positions)
+    survives downsampling.
+    Args:
+        chr_codes: integer chromosome codes of variants
+        bp: positions of variants on chromosome
+        log10p: -log10(p-value) of variants
+        nbins: number of bins
+    Returns:
+        integer positions of selected variants
+    """
+    order = np.lexsort((bp, chr_codes))
+    log10p_sorted = log10p[order]
+    edges = np.linspace(0, len(order), nbins+1).astype(int)
+    pos = []
+    for lo, hi in zip(edges[:-1], edges[1:]):
+        if hi > lo:
+            pos.append(lo + np.argmax(log10p_sorted[lo:hi]))
+            pos.append(lo + np.argmin(log10p_sorted[lo:hi]))
+    return order[np.unique(pos)]
 
 
 def filter_sumstats(sumstats_f, sep, snpid_col, pval_col, chr_col, bp_col, chr2use):
@@ -213,25 +286,68 @@ def filter_sumstats(sumstats_f, sep, snpid_col, pval_col, chr_col, bp_col, chr2u
     """
     print("Filtering %s" % sumstats_f)
     cols2use = [snpid_col, pval_col, chr_col, bp_col]
-    df = pd.read_table(sumstats_f, usecols=cols2use, sep=sep,
-        dtype={chr_col:str})
-    print("%d SNPs in %s" % (len(df), sumstats_f))
-    df = df.loc[~df[snpid_col].isnull(), :].set_index(snpid_col)
-    print("%d SNPs with non-null SNP" % len(df))
-    # TODO: replace dropna with df = df.loc[df[pval_col]>0,:], should be ~ 1.5x faster
-    df.dropna(subset=[pval_col], how="all", inplace = True)
-    print("%d SNPs with defined p-value" % len(df))
-    df = df.loc[df[chr_col].isin(chr2use),:]
-    print("%d SNPs within specified chromosomes" % len(df))
-    # TODO: zero filtering step is very slow, should be optimized
-    df = df.loc[df[pval_col]>0,:]
-    print("%d SNPs with non-zero p-value" % len(df))
+    try:
+        # pyarrow reads the file in parallel and filters rows before they are
+        # ever materialized as a DataFrame, which for typical survival rates
+        # avoids deserializing most of the file into pandas
+        import pyarrow as pa
+        import pyarrow.csv
+        import pyarrow.compute as pc
+        assert len(sep) == 1  # pyarrow supports only single-char delimiters
+        table = pa.csv.read_csv(sumstats_f,
+            read_options=pa.csv.ReadOptions(block_size=64<<20),
+            parse_options=pa.csv.ParseOptions(delimiter=sep),
+            convert_options=pa.csv.ConvertOptions(include_columns=cols2use,
+                # dictionary-encoded chromosomes become a pandas category
+                # column, so downstream isin/groupby work on integer codes
+                # rather than python strings
+                column_types={chr_col:pa.dictionary(pa.int32(), pa.string()),
+                    pval_col:pa.float64()},
+                strings_can_be_null=True))  # empty SNP id field = missing
+        print("%d SNPs in %s" % (table.num_rows, sumstats_f))
+        keep = pc.and_(pc.is_valid(table[snpid_col]),
+            pc.and_(pc.greater(table[pval_col], 0),
+                pc.is_in(table[chr_col], value_set=pa.array(chr2use))))
+        df = table.filter(keep).to_pandas(split_blocks=True,
+            self_destruct=True).set_index(snpid_col)
+    except (ImportError, AssertionError):
+        # fall back to chunked pandas read, filtering each chunk with a single
+        # boolean mask so only surviving rows are kept in memory
+        n_snps = 0
+        chunks = []
+        chr2use_arr = np.asarray(chr2use)  # convert once, not per chunk
+        for chunk in pd.read_table(sumstats_f, usecols=cols2use, sep=sep,
+                dtype={chr_col:str}, chunksize=1000000):
+            n_snps += len(chunk)
+            pvals = chunk[pval_col].values
+            mask = ~chunk[snpid_col].isnull().values
+            mask &= pvals > 0  # NaN p-values fail this comparison as well
+            mask &= np.isin(chunk[chr_col].values, chr2use_arr)
+            chunks.append(chunk[mask])
+        print("%d SNPs in %s" % (n_snps, sumstats_f))
+        df = pd.concat(chunks).set_index(snpid_col)
+    print("%d SNPs with non-null SNP id, non-zero p-value and chromosome "
+        "within specified chromosomes" % len(df))
+    # fix chromosome categories to chr2use so category codes are identical
+    # across input files and all downstream chr-keyed operations (groupby,
+    # gathers in add_coords) run on small integer codes
+    if hasattr(df[chr_col], "cat"):
+        # the pyarrow dictionary keeps every chromosome seen in the file,
+        # including ones filtered out above (e.g. X/Y outside chr2use);
+        # recoding such a Categorical via the pd.Categorical constructor is
+        # deprecated, set_categories does the same recode cleanly
+        df[chr_col] = df[chr_col].cat.set_categories(chr2use)
+    else:
+        df[chr_col] = pd.Categorical(df[chr_col], categories=chr2use)
+    # -log10(p) is needed both as sampling weight in get_df2plot and as y
+    # coordinate in add_coords; compute it once here and carry the column
+    df["log10p"] = -np.log10(df[pval_col].values)
     # TODO: drop duplicates as it is done in qq.py
     return df
 
 
 def get_df2plot(df, outlined_snps_f, bold_snps_f, lead_snps_f, indep_snps_f,
-    annot_f, snps_to_keep_f, downsample_frac, pval_col):
+    annot_f, snps_to_keep_f, downsample_frac, chr_col, bp_col, rng):
     """
     Select variants which will be plotted. Mark lead and independent significant
     variants if corresponding information is provided.
@@ -245,7 +361,9 @@ def get_df2plot(df, outlined_snps_f, bold_snps_f, lead_snps_f, indep_snps_f,
             variants are considered when downsampling take place 
         downsample_frac: a fraction of variants which will be sampled from df
             for plotting
-        pval_col: a column with p-values in df
+        chr_col: a column with chromosomes in df
+        bp_col: a column with positions on chromosome in df
+        rng: numpy random Generator used for downsampling
     Returns:
         df2plot: DataFrame with variants for plotting
     """
@@ -256,42 +374,103 @@ def get_df2plot(df, outlined_snps_f, bold_snps_f, lead_snps_f, indep_snps_f,
     bold_snp_ids = get_snp_ids(bold_snps_f)
     lead_snp_id = get_lead(lead_snps_f)
     indep_snp_id = get_indep_sig(indep_snps_f)
-    annot_series = get_annot(annot_f)
-    outlined_snp_ids = np.unique(np.concatenate((outlined_snp_ids, lead_snp_id)))
-    bold_snp_ids = np.unique(np.concatenate((bold_snp_ids, indep_snp_id)))
+    # pd.unique deduplicates via a hash table, avoiding the O(N log N)
+    # object-sort that np.unique performs on string arrays
+    outlined_snp_ids = pd.unique(np.concatenate((outlined_snp_ids, lead_snp_id)))
+    bold_snp_ids = pd.unique(np.concatenate((bold_snp_ids, indep_snp_id)))
     # sample variants
     if snps_to_keep_f != "NA":
         snps2keep = get_snp_ids(snps_to_keep_f)
-        ii = df.index.intersection(snps2keep)
-        df = df.loc[ii,:]
+        pos = df.index.get_indexer_for(snps2keep)
+        df = df.take(pos[pos>=0])
         print("%d SNPs overlap with %s" % (len(df),snps_to_keep_f))
     n = int(downsample_frac*len(df))
     # w = 1/df[pval_col].values
-    w = -np.log10(df[pval_col].values)
-    w /= sum(w)
-    snp_sample = np.random.choice(df.index,size=n,replace=False,p=w)
+    w = df["log10p"].values  # = -log10(p), precomputed in filter_sumstats
+    if n > 0:
+        # spend part of the budget on a deterministic per-bin min/max envelope
+        # (so the peaks of the plot always survive) and the rest on a weighted
+        # random sample preserving the bulk of the point cloud
+        nbins = min(4000, n//2)
+        if nbins > 0:
+            if hasattr(df[chr_col], "cat"):
+                chr_codes = df[chr_col].cat.codes.values
+            else:
+                chr_codes = pd.factorize(df[chr_col].values)[0]
+            envelope_pos = minmax_bin_sample(chr_codes, df[bp_col].values, w, nbins)
+        else:
+            envelope_pos = np.array([], dtype=int)
+        n_rest = n - len(envelope_pos)
+        if n_rest > 0:
+            sample_pos = np.concatenate((envelope_pos, gumbel_top_n(w, n_rest, rng)))
+        else:
+            sample_pos = envelope_pos
+        snp_sample = df.index.values[sample_pos]
+    else:
+        snp_sample = np.array([])
     # TODO: keep SNPs within identified loci with higher prob?
     # NOTE: it could be that there are snp ids in outlined_snp_ids or bold_snp_ids which
-    # are not in df.index, therefore we should take an index.intersection first.
-    outlined_snp_ids = df.index.intersection(outlined_snp_ids)
-    bold_snp_ids = df.index.intersection(bold_snp_ids)
-    annot_snp_ids = df.index.intersection(annot_series.index)
-    snps2keep = np.unique(np.concatenate((outlined_snp_ids, bold_snp_ids,
+    # are not in df.index, therefore we should drop ids which are not in df.
+    # A single hash set of df.index is built once and shared by all three
+    # membership tests (index.intersection would rehash the index each time).
+    idx_set = set(df.index.values.tolist())
+    outlined_snp_ids = np.array([s for s in outlined_snp_ids if s in idx_set])
+    bold_snp_ids = np.array([s for s in bold_snp_ids if s in idx_set])
+    annot_series = get_annot(annot_f, idx_set)
+    annot_snp_ids = annot_series.index.values
+    snps2keep = pd.unique(np.concatenate((outlined_snp_ids, bold_snp_ids,
         snp_sample, annot_snp_ids)))
-    df2plot = df.loc[snps2keep,:]
-    df2plot.loc[:,"outlined"] = False
-    df2plot.loc[outlined_snp_ids,"outlined"] = True
-    df2plot.loc[:,"bold"] = False
-    df2plot.loc[bold_snp_ids,"bold"] = True
-    df2plot.loc[:,"annot"] = ""
-    df2plot.loc[annot_snp_ids,"annot"] = annot_series[annot_snp_ids]
+    # resolve labels to positions once and gather with take: .loc on a large
+    # index would probe the hashtable per key and go through the BlockManager
+    pos = df.index.get_indexer_for(snps2keep)
+    df2plot = df.take(pos[pos>=0])
+    # resolve all snp id lookups to integer positions once, then build the
+    # marker columns as plain arrays; this avoids three label-based
+    # .loc[ids, col] = ... assignments which each probe the index hashtable
+    outlined_mask = np.zeros(len(df2plot), dtype=bool)
+    outlined_mask[df2plot.index.get_indexer_for(outlined_snp_ids)] = True
+    bold_mask = np.zeros(len(df2plot), dtype=bool)
+    bold_mask[df2plot.index.get_indexer_for(bold_snp_ids)] = True
+    # labels are gathered with a label-aligned reindex rather than positional
+    # assignment: annot_series has a unique index, so reindexing it against the
+    # plot index labels every plotted row even when a snp id is duplicated
+    annot_arr = annot_series.reindex(df2plot.index).fillna("").values
+    # attach all three columns atomically: one block consolidation instead of
+    # three separate column insertions fragmenting the frame
+    df2plot = df2plot.assign(outlined=outlined_mask, bold=bold_mask,
+        annot=annot_arr)
     print("%d outlined SNPs" % len(outlined_snp_ids))
     print("%d bold SNPs" % len(bold_snp_ids))
     print("%d annotated SNPs" % len(annot_snp_ids))
     print("%d SNPs will be plotted in total" % len(df2plot))
+    # record the y axis limit hint from the variants which are actually
+    # plotted: the --snps-to-keep restriction and downsampling may exclude
+    # the overall top variant of the sumstats file
+    df2plot.attrs["max_log10p"] = float(df2plot["log10p"].values.max()) if len(df2plot) else 0.0
     return df2plot
 
 
+def process_sumstats_file(sumstats_f, sep, snpid_col, pval_col, chr_col, bp_col,
+    chr2use, outlined_snps_f, bold_snps_f, lead_snps_f, indep_snps_f, annot_f,
+    snps_to_keep_f, downsample_frac, seed):
+    """
+    Filter a single sumstats file and select variants for plotting, i.e. run
+    filter_sumstats followed by get_df2plot. Sumstats files are independent, so
+    this function is dispatched to a worker process per file; only the reduced
+    df2plot frame is sent back to the parent process. Each file gets its own
+    generator seeded with seed, keeping the figure reproducible regardless of
+    worker scheduling.
+    """
+    df = filter_sumstats(sumstats_f, sep, snpid_col, pval_col, chr_col, bp_col,
+        chr2use)
+    # PCG64 (default_rng) generates random doubles considerably faster than
+    # the legacy MT19937 RandomState
+    rng = np.random.default_rng(seed)
+    return get_df2plot(df, outlined_snps_f, bold_snps_f, lead_snps_f,
+        indep_snps_f, annot_f, snps_to_keep_f, downsample_frac, chr_col,
+        bp_col, rng)
+
+
 def get_chr_df(dfs2plot, bp_cols, chr_cols, between_chr_gap, chr2use):
     """
     Construct DataFrame with index = chromosome names and 5 columns:
@@ -312,18 +491,22 @@ def get_chr_df(dfs2plot, bp_cols, chr_cols, between_chr_gap, chr2use):
     Returns:
         chr_df: a DataFrame with chromosome information as described above
     """
-    unique_chr = np.unique(np.concatenate([df[chr_cols[i]].unique() for i,df in enumerate(dfs2plot)]))
-    unique_chr = [c for c in chr2use if c in unique_chr]
-    chr_df = pd.DataFrame(index=unique_chr, columns=["min","max","ind","start","rel_size"])
-    min_df = pd.DataFrame(index=unique_chr)
-    max_df = pd.DataFrame(index=unique_chr)
+    # running per-chromosome min/max keyed by position in chr2use: one pass
+    # per frame updates two small arrays, instead of accumulating per-file
+    # groupby results in wide intermediate frames
+    chr_min = np.full(len(chr2use), np.inf)
+    chr_max = np.full(len(chr2use), -np.inf)
     for i,df in enumerate(dfs2plot):
-        chr_min = df.groupby(chr_cols[i])[bp_cols[i]].min()
-        chr_max = df.groupby(chr_cols[i])[bp_cols[i]].max()
-        min_df[i] = chr_min
-        max_df[i] = chr_max
-    chr_df["min"] = min_df.min(axis=1)
-    chr_df["max"] = max_df.max(axis=1)
+        codes = pd.Categorical(df[chr_cols[i]], categories=chr2use).codes
+        bp = df[bp_cols[i]].values
+        valid = codes >= 0
+        np.minimum.at(chr_min, codes[valid], bp[valid])
+        np.maximum.at(chr_max, codes[valid], bp[valid])
+    observed = np.isfinite(chr_min)
+    unique_chr = [c for c, obs in zip(chr2use, observed) if obs]
+    chr_df = pd.DataFrame(index=unique_chr, columns=["min","max","ind","start","rel_size"])
+    chr_df["min"] = chr_min[observed]
+    chr_df["max"] = chr_max[observed]
     chr_df["ind"] = np.arange(len(unique_chr))
     # use the first chr form unique_chr as a reference unit size
     ref_unit_size = chr_df.loc[chr_df.index[0],"max"] - chr_df.loc[chr_df.index[0],"min"]
@@ -332,21 +515,31 @@ def get_chr_df(dfs2plot, bp_cols, chr_cols, between_chr_gap, chr2use):
     return chr_df
 
 
-def add_coords(df2plot, chr_col, bp_col, pval_col, chr_df):
+def add_coords(df2plot, chr_col, bp_col, chr_df):
     """
-    Modify provided DataFrame df2plot by adding columns with x-y coordinates for
-    plotting to it.
+    Modify provided DataFrame df2plot by adding a column with x coordinates for
+    plotting to it. The y coordinate ("log10p" column) is already present since
+    filter_sumstats.
     Args:
         df2plot: DataFrame with variants for plotting (produced by get_df2plot)
         chr_col: a column with chromosome of variants in df2plot
         bp_col: a column with position on chromosome of variants in df2plot
-        pval_col: a column with variant p-values
         chr_df: a DataFrame with chromosome information (produced by get_chr_df)
     """
-    chr_start = chr_df.loc[df2plot[chr_col], "start"].values
-    chr_min = chr_df.loc[df2plot[chr_col], "min"].values
-    df2plot.loc[:,"x_coord"] = (df2plot[bp_col] - chr_min)/chr_df.loc[chr_df.index[0],"max"] + chr_start
-    df2plot.loc[:,"log10p"] = -np.log10(df2plot[pval_col]) # y coord
+    # chromosome labels resolve to chr_df rows once (per category), then
+    # per-variant values are gathered by integer category codes; the rest is
+    # plain ndarray arithmetic
+    if hasattr(df2plot[chr_col], "cat"):
+        chr_sub = chr_df[["start","min"]].reindex(df2plot[chr_col].cat.categories)
+        codes = df2plot[chr_col].cat.codes.values
+        chr_start = chr_sub["start"].values[codes]
+        chr_min = chr_sub["min"].values[codes]
+    else:
+        chr_sub = chr_df[["start","min"]].reindex(df2plot[chr_col].values)
+        chr_start = chr_sub["start"].values
+        chr_min = chr_sub["min"].values
+    ref_chr_max = chr_df.loc[chr_df.index[0],"max"]
+    df2plot["x_coord"] = (df2plot[bp_col].values - chr_min)/ref_chr_max + chr_start
 
 
 def add_striped_background(chr_df, ax, y_up):
@@ -370,8 +563,6 @@ if __name__ == "__main__":
     args = parse_args(sys.argv[1:])
     process_args(args)
 
-    np.random.seed(args.seed)
-
     if args.cb_colors:
         assert len(args.sumstats) <= len(CB_COLOR_NAMES), "%d is maximum number of sumstats to plot simultaneously with color-blind color scheme" % len(CB_COLOR_NAMES)
         color_names = CB_COLOR_NAMES
@@ -388,18 +579,26 @@ if __name__ == "__main__":
         for i,ll in enumerate(args.legend_labels)]
     legends_handles = []
 
-    sumstat_dfs = [
-        filter_sumstats(s, args.sep[i], args.snp[i], args.p[i], args.chr[i], args.bp[i], args.chr2use)
+    # sumstats files are processed independently, so filtering + variant
+    # selection runs in a worker process per file; each file is seeded with
+    # args.seed + i to keep the figure reproducible
+    worker_args = [(s, args.sep[i], args.snp[i], args.p[i], args.chr[i],
+            args.bp[i], args.chr2use, args.outlined[i], args.bold[i],
+            args.lead[i], args.indep[i], args.annot[i], args.snps_to_keep[i],
+            args.downsample_frac[i], args.seed + i)
         for i,s in enumerate(args.sumstats)]
-
-    dfs2plot = [get_df2plot(df, args.outlined[i], args.bold[i], args.lead[i], args.indep[i],
-                            args.annot[i], args.snps_to_keep[i], args.downsample_frac[i], args.p[i])
-        for i, df in enumerate(sumstat_dfs)]
+    if len(worker_args) == 1:
+        dfs2plot = [process_sumstats_file(*worker_args[0])]
+    else:
+        with concurrent.futures.ProcessPoolExecutor(
+                max_workers=min(len(worker_args), os.cpu_count())) as executor:
+            futures = [executor.submit(process_sumstats_file, *wa) for wa in worker_args]
+            dfs2plot = [f.result() for f in futures]
 
     chr_df = get_chr_df(dfs2plot, args.bp, args.chr, args.between_chr_gap, args.chr2use)
 
     for i,df in enumerate(dfs2plot):
-        add_coords(df, args.chr[i], args.bp[i], args.p[i], chr_df)
+        add_coords(df, args.chr[i], args.bp[i], chr_df)
 
     n_subplots = len(dfs2plot) if args.separate_sumstats else 1
 
@@ -410,7 +609,7 @@ if __name__ == "__main__":
 
 
     # find upper limit for Y axis
-    y_up = max([df["log10p"].max() for df in dfs2plot])
+    y_up = max([df.attrs.get("max_log10p", df["log10p"].max()) for df in dfs2plot])
     y_up = max(y_up, -np.log10(args.p_thresh))
     y_up *= 1.05
 
@@ -424,8 +623,12 @@ if __name__ == "__main__":
         ax = axarr[ax_i]
         
         color = color_dict[color_names[i]]
-        ax.plot(df["x_coord"], df["log10p"], ls=' ', marker='.', ms=2,
-            color=color, alpha=args.transparency[i])
+        # a single scatter collection with rasterized=True: the dense point
+        # cloud becomes one raster layer in vector output (pdf/svg) while
+        # axes, labels and highlighted points stay vector
+        ax.scatter(df["x_coord"].values, df["log10p"].values, s=4, marker='.',
+            color=color, alpha=args.transparency[i], edgecolors='none',
+            rasterized=True)
         patch = mpatches.Patch(color=color, label=legend_labels[i])
         legends_handles.append(patch)
     for i, df in enumerate(dfs2plot):
@@ -441,15 +644,20 @@ if __name__ == "__main__":
         ax.plot(df_tmp["x_coord"], df_tmp["log10p"], ls=' ', marker='o', ms=8,
             markeredgewidth=0.6, markeredgecolor='k', color=color)
         df_tmp = df.loc[df["annot"]!="",["annot","x_coord", "log10p"]]
-        pe = [mpe.Stroke(linewidth=0.8, foreground='black')]
-        for row in df_tmp.itertuples():
-            color = color_dict[color_names_annot[i]]
-            ax.annotate(row.annot, xy=(row.x_coord, row.log10p), xycoords='data',
-                xytext=(2,2), textcoords='offset points', color=color,
-                fontsize=12, style='italic', fontweight='heavy',
-                # path_effects=pe, # uncomment path_effects to have a black border of the label symbols 
-                bbox={"boxstyle":"square, pad=0.02", "facecolor":"white",
-                      "edgecolor":"none","alpha":0.6})
+        # plain ax.text artists with a shared offset transform instead of
+        # per-row ax.annotate: skips the annotation machinery (arrow, picker)
+        # and the itertuples python overhead; the transform replicates
+        # annotate's xytext=(2,2) points offset
+        color = color_dict[color_names_annot[i]]
+        label_trans = mtransforms.offset_copy(ax.transData, fig=fig, x=2, y=2,
+            units='points')
+        label_bbox = {"boxstyle":"square, pad=0.02", "facecolor":"white",
+            "edgecolor":"none", "alpha":0.6}
+        # import matplotlib.patheffects as mpe; pe = [mpe.Stroke(linewidth=0.8, foreground='black')] # pass path_effects=pe below to have a black border of the label symbols
+        for x, y, label in zip(df_tmp["x_coord"].values.tolist(),
+                df_tmp["log10p"].values.tolist(), df_tmp["annot"].values.tolist()):
+            ax.text(x, y, label, transform=label_trans, color=color,
+                fontsize=12, style='italic', fontweight='heavy', bbox=label_bbox)
 
     for i,ax in enumerate(axarr):
         ax.hlines([-np.log10(args.p_thresh)], 0, 1, colors='k', linestyles='dotted',
@@ -0,0 +1,35 @@
+import os.path
+import sys
+import tempfile
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+import manhattan
+
+
+def test_annot_with_duplicated_snp_ids():
+    # sumstats files may contain duplicated snp ids (see the drop-duplicates
+    # TODO in filter_sumstats); annotation labels must still be attached to
+    # every plotted row of a duplicated id
+    rng = np.random.default_rng(1)
+    pvals = [1e-9, 1e-8, 1e-7, 0.5, 0.4]
+    df = pd.DataFrame({"PVAL": pvals,
+                       "CHR": ["1", "1", "2", "2", "2"],
+                       "BP": [100, 200, 100, 200, 300],
+                       "log10p": -np.log10(pvals)},
+                      index=["rs1", "rs1", "rs2", "rs3", "rs4"])
+    with tempfile.NamedTemporaryFile("w", suffix=".tsv", delete=False) as f:
+        f.write("rs1\tGENE1\nrs2\tGENE2\nrs_absent\tGENEX\n")
+        annot_f = f.name
+    try:
+        df2plot = manhattan.get_df2plot(df, "NA", "NA", "NA", "NA", annot_f,
+            "NA", 1.0, "CHR", "BP", rng)
+    finally:
+        os.remove(annot_f)
+
+    annot = df2plot["annot"]
+    assert list(annot.loc["rs1"]) == ["GENE1", "GENE1"]
+    assert annot.loc["rs2"] == "GENE2"
+    # rows without annotation (if sampled) must stay unlabeled
+    assert all(annot[~annot.index.isin(["rs1", "rs2"])] == "")